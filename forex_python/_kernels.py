@@ -0,0 +1,24 @@
+"""
+Array kernels for portfolio conversion
+
+Imported on first use by CurrencyRates.convert_portfolio, numpy and especially
+numba are slow to import and most callers never need them.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def apply_rates(amounts, rates_vec, idx):
+        out = np.empty_like(amounts)
+        for i in numba.prange(amounts.size):
+            out[i] = amounts[i] * rates_vec[idx[i]]
+        return out
+else:
+    def apply_rates(amounts, rates_vec, idx):
+        return amounts * rates_vec[idx]
@@ -0,0 +1,119 @@
+"""
+Currency rates and conversion with asyncio, using aiohttp
+
+Rates are shared with CurrencyRates through the same cache, so a rate fetched
+by either class is not fetched again by the other.
+
+    >>> import asyncio
+    >>> from forex_python.aio_converter import AsyncCurrencyRates
+    >>> async def main():
+    ...     async with AsyncCurrencyRates() as c:
+    ...         return await asyncio.gather(c.get_rates('USD'), c.get_rates('EUR'), c.convert('USD', 'INR', 10))
+    >>> loop = asyncio.get_event_loop()
+    >>> usd_rates, eur_rates, inr_amount = loop.run_until_complete(main())
+"""
+import asyncio
+from decimal import Decimal
+
+import aiohttp
+
+from .converter import (_SOURCE_URL, Common, RatesNotAvailableError, DecimalFloatMismatchError,
+                        _flush_rates_cache, _load_rates_cache)
+
+
+class AsyncCurrencyRates(Common):
+
+    def __init__(self, force_decimal=False, cache_ttl=3600):
+        super(AsyncCurrencyRates, self).__init__(force_decimal=force_decimal, cache_ttl=cache_ttl)
+        self._client = None
+        self._cache_loaded = False
+
+    async def __aenter__(self):
+        await self._load_cache()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying aiohttp session and write fetched rates to the on-disk cache
+        """
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        # Fetches only update the in-memory cache, the file is written off the event loop
+        await asyncio.get_event_loop().run_in_executor(None, _flush_rates_cache)
+
+    async def _load_cache(self):
+        # The on-disk cache is read off the event loop, _get_fresh_rates then finds it loaded
+        if not self._cache_loaded:
+            await asyncio.get_event_loop().run_in_executor(None, _load_rates_cache)
+            self._cache_loaded = True
+
+    def _get_client(self):
+        # Created on first use, aiohttp sessions must be made inside a running event loop
+        if self._client is None:
+            self._client = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
+        return self._client
+
+    async def _get_rates(self, base_cur, date_str, use_decimal=False):
+        use_decimal = bool(self._force_decimal or use_decimal)
+        await self._load_cache()
+        rates = self._get_fresh_rates(base_cur, date_str, use_decimal)
+        if rates is not None:
+            return rates
+
+        key = (base_cur, date_str, use_decimal)
+        payload = {'base': base_cur, 'rtype': 'fpy'}
+        source_url = f"{_SOURCE_URL}{date_str}"
+        async with self._get_client().get(
+                source_url, params=payload, headers=self._get_request_headers(key)) as response:
+            body = await response.read()
+            return self._store_rates(key, response.status, response.headers, body)
+
+    async def get_rates(self, base_cur, date_obj=None):
+        date_str = self._get_date_string(date_obj)
+        return dict(await self._get_rates(base_cur, date_str))
+
+    async def get_rate(self, base_cur, dest_cur, date_obj=None):
+        if base_cur == dest_cur:
+            if self._force_decimal:
+                return Decimal(1)
+            return 1.
+        date_str = self._get_date_string(date_obj)
+        rate = (await self._get_rates(base_cur, date_str)).get(dest_cur, None)
+        if rate is None:
+            raise RatesNotAvailableError(
+                f"Currency Rate {base_cur} => {dest_cur} not available for Date {date_str}")
+        return rate
+
+    async def get_rates_for(self, base_cur, dest_currs, date_obj=None):
+        """
+        Get rates from base_cur to each of dest_currs with a single request
+        """
+        date_str = self._get_date_string(date_obj)
+        rates = await self._get_rates(base_cur, date_str)
+        return self._select_rates(rates, base_cur, dest_currs, date_str)
+
+    async def convert(self, base_cur, dest_cur, amount, date_obj=None):
+        if isinstance(amount, Decimal):
+            use_decimal = True
+        else:
+            use_decimal = self._force_decimal
+
+        if base_cur == dest_cur:  # Return same amount if both base_cur, dest_cur are same
+            if use_decimal:
+                return Decimal(amount)
+            return float(amount)
+
+        date_str = self._get_date_string(date_obj)
+        rate = (await self._get_rates(base_cur, date_str, use_decimal=use_decimal)).get(dest_cur, None)
+        if rate is None:
+            raise RatesNotAvailableError(
+                f"Currency {base_cur} => {dest_cur} rate not available for Date {date_str}.")
+        try:
+            return rate * amount
+        except TypeError:
+            raise DecimalFloatMismatchError(
+                "convert requires amount parameter is of type Decimal when force_decimal=True")
@@ -1,7 +1,7 @@
 from decimal import Decimal
 import simplejson as json
 import requests
-from .converter import RatesNotAvailableError, DecimalFloatMismatchError
+from .converter import RatesNotAvailableError, DecimalFloatMismatchError, _loads
 
 
 class BtcConverter(object):
@@ -13,9 +13,9 @@ class BtcConverter(object):
 
     def _decode_rates(self, response, use_decimal=False):
         if self._force_decimal or use_decimal:
-            decoded_data = json.loads(response.text, use_decimal=True)
+            decoded_data = json.loads(response.content, use_decimal=True)
         else:
-            decoded_data = response.json()
+            decoded_data = _loads(response.content)
         return decoded_data
 
     def get_latest_price(self, currency):
@@ -25,7 +25,7 @@ class BtcConverter(object):
         url = 'https://api.coindesk.com/v1/bpi/currentprice/{}.json'.format(currency)
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi').get(currency, {}).get('rate_float', None)
             if self._force_decimal:
                 return Decimal(price)
@@ -46,7 +46,7 @@ class BtcConverter(object):
         )
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi', {}).get(start, None)
             if self._force_decimal:
                 return Decimal(price)
@@ -84,7 +84,7 @@ class BtcConverter(object):
         url = 'https://api.coindesk.com/v1/bpi/currentprice/{}.json'.format(currency)
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi').get(currency, {}).get('rate_float', None)
             if price:
                 if use_decimal:
@@ -108,7 +108,7 @@ class BtcConverter(object):
         url = 'https://api.coindesk.com/v1/bpi/currentprice/{}.json'.format(currency)
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi').get(currency, {}).get('rate_float', None)
             if price:
                 if use_decimal:
@@ -139,7 +139,7 @@ class BtcConverter(object):
         )
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi', {}).get(start, None)
             if price:
                 if use_decimal:
@@ -170,7 +170,7 @@ class BtcConverter(object):
         )
         response = requests.get(url, timeout=60)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = data.get('bpi', {}).get(start, None)
             if price:
                 if use_decimal:
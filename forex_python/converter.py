@@ -1,8 +1,44 @@
+import atexit
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from decimal import Decimal
+from json import loads as _std_loads
 
 import requests
 import simplejson as json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Streaming parsers such as ijson were measured slower than both orjson and the stdlib C
+# decoder on rates bodies, and every fetch decodes the whole table for the cache anyway
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = _std_loads
+
+_SOURCE_URL = "https://theforexapi.com/api/"
+
+# Decoded rates keyed by (base_cur, date_str, use_decimal) => (stored_at, rates)
+_RATES_CACHE = {}
+# Conditional request headers (ETag, Last-Modified) for revalidating stale _RATES_CACHE entries
+_RATES_VALIDATORS = {}
+_RATES_CACHE_LOCK = threading.Lock()
+# Per-user cache directory, a shared temp dir would let other users plant rates
+_RATES_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'forex_python', 'rates.json')
+_RATES_CACHE_MAX_ENTRIES = 4096
+_rates_cache_loaded = False
+_EPOCH = date(1970, 1, 1)
+# (time.time() to recompute at, settled ISO date), see _get_settled_date
+_settled_date = (0., '')
+# Set when _RATES_CACHE has entries that are not on disk yet
+_rates_cache_dirty = False
 
 
 class RatesNotAvailableError(Exception):
@@ -19,47 +55,269 @@ class DecimalFloatMismatchError(Exception):
     pass
 
 
+def _import_numpy(caller):
+    # numpy is optional and only imported by the array conversions
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"{caller} requires numpy")
+    return numpy
+
+
+@lru_cache(maxsize=4096)
+def _iso(date_obj):
+    if isinstance(date_obj, datetime):
+        date_obj = date_obj.date()
+    return date_obj.isoformat()
+
+
+def _get_settled_date():
+    """
+    ISO date before which rates never change, recomputed once per UTC day
+    The cutoff is in UTC with a day of margin, so a date ECB hasn't published yet
+    in CET is never cached as the day before's table
+    """
+    global _settled_date
+    recompute_at, settled = _settled_date
+    now = time.time()
+    if now >= recompute_at:
+        days = int(now // 86400)  # Days since the epoch, POSIX time has no leap seconds
+        settled = (_EPOCH + timedelta(days=days - 1)).isoformat()
+        _settled_date = ((days + 1) * 86400, settled)
+    return settled
+
+
+def _load_rates_cache():
+    """
+    Fill the in-memory rates cache from the on-disk cache file, once per process
+    """
+    global _rates_cache_loaded
+    if _rates_cache_loaded:
+        return
+    with _RATES_CACHE_LOCK:
+        if _rates_cache_loaded:
+            return
+        _rates_cache_loaded = True
+        try:
+            with open(_RATES_CACHE_FILE) as f:
+                stat = os.fstat(f.fileno())
+                # Only trust a file we own and nobody else can write to
+                if hasattr(os, 'getuid') and (stat.st_uid != os.getuid() or stat.st_mode & 0o022):
+                    return
+                entries = json.loads(f.read(), use_decimal=True)
+            for base_cur, date_str, use_decimal, stored_at, rates, validators in entries:
+                if not use_decimal:
+                    rates = dict((cur, float(rate)) for cur, rate in rates.items())
+                key = (base_cur, date_str, use_decimal)
+                _RATES_CACHE.setdefault(key, (float(stored_at), rates))
+                _RATES_VALIDATORS.setdefault(key, validators)
+        except (IOError, OSError, ValueError, TypeError, AttributeError):
+            # Missing or corrupt cache file, start with whatever was read so far
+            pass
+        _prune_rates_cache()
+
+
+def _prune_rates_cache():
+    """
+    Drop the oldest entries once the cache is over its size cap, caller must hold _RATES_CACHE_LOCK
+    """
+    if len(_RATES_CACHE) <= _RATES_CACHE_MAX_ENTRIES:
+        return
+    # Prune down to 3/4 of the cap so the sort isn't repeated on every new entry
+    by_age = sorted(_RATES_CACHE, key=lambda key: _RATES_CACHE[key][0], reverse=True)
+    for key in by_age[_RATES_CACHE_MAX_ENTRIES * 3 // 4:]:
+        del _RATES_CACHE[key]
+        _RATES_VALIDATORS.pop(key, None)
+
+
+def _set_rates(key, rates, validators, stored_at=None, dirty=True):
+    """
+    Put rates for key in the in-memory cache
+    """
+    global _rates_cache_dirty
+    with _RATES_CACHE_LOCK:
+        _RATES_CACHE[key] = (time.time() if stored_at is None else stored_at, rates)
+        _RATES_VALIDATORS[key] = validators
+        _rates_cache_dirty = _rates_cache_dirty or dirty
+        _prune_rates_cache()
+
+
+def _flush_rates_cache():
+    """
+    Write the rates cache to disk if it changed since the last write
+    Runs at exit and after batch lookups, not on every fetched rate
+    """
+    global _rates_cache_dirty
+    with _RATES_CACHE_LOCK:
+        if not _rates_cache_dirty:
+            return
+        _rates_cache_dirty = False
+        # Cached rates dicts are never modified in place, so the snapshot can share them
+        entries = [[key[0], key[1], key[2], stored_at, rates, _RATES_VALIDATORS.get(key, {})]
+                   for key, (stored_at, rates) in _RATES_CACHE.items()]
+    tmp_path = None
+    try:
+        cache_dir = os.path.dirname(_RATES_CACHE_FILE)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # mkstemp creates the file with 0600 permissions
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps(entries))
+        os.replace(tmp_path, _RATES_CACHE_FILE)
+    except (IOError, OSError):
+        # Don't leave a partly written temp file behind, e.g. when the disk is full
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+atexit.register(_flush_rates_cache)
+
+
 class Common:
 
-    def __init__(self, force_decimal=False):
+    def __init__(self, force_decimal=False, cache_ttl=3600):
         self._force_decimal = force_decimal
+        self._cache_ttl = cache_ttl
+        self.__session = None
 
-    def _source_url(self):
-        return "https://theforexapi.com/api/"
+    @property
+    def _session(self):
+        # Keep-alive session, reused by every request this instance makes
+        if self.__session is None:
+            session = requests.Session()
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                          raise_on_status=False)
+            session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+            self.__session = session
+        return self.__session
 
     def _get_date_string(self, date_obj):
         if date_obj is None:
             return 'latest'
-        date_str = date_obj.strftime('%Y-%m-%d')
-        return date_str
+        return _iso(date_obj)
 
-    def _decode_rates(self, response, use_decimal=False, date_str=None):
+    def _decode_rates(self, body, use_decimal=False, date_str=None):
         if self._force_decimal or use_decimal:
-            decoded_data = json.loads(response.text, use_decimal=True)
+            # The stdlib C decoder builds each Decimal straight from its literal
+            decoded_data = _std_loads(body, parse_float=Decimal)
         else:
-            decoded_data = response.json()
+            decoded_data = _loads(body)
         # if (date_str and date_str != 'latest' and date_str != decoded_data.get('date')):
         #     raise RatesNotAvailableError("Currency Rates Source Not Ready")
         return decoded_data.get('rates', {})
 
-    def _get_decoded_rate(
-            self, response, dest_cur, use_decimal=False, date_str=None):
-        return self._decode_rates(
-            response, use_decimal=use_decimal, date_str=date_str).get(
-            dest_cur, None)
+    def _get_cache_ttl(self, date_str):
+        if date_str != 'latest' and date_str < _get_settled_date():
+            return float('inf')
+        return self._cache_ttl
+
+    def _get_cached_rates(self, base_cur, date_str, use_decimal):
+        cached = _RATES_CACHE.get((base_cur, date_str, use_decimal))
+        if cached is not None and time.time() - cached[0] < self._get_cache_ttl(date_str):
+            return cached
+        return None
+
+    def _get_fresh_rates(self, base_cur, date_str, use_decimal):
+        """
+        Rates for base_cur on date_str from the cache, None if they have to be fetched
+        """
+        _load_rates_cache()
+        cached = self._get_cached_rates(base_cur, date_str, use_decimal)
+        if cached is not None:
+            return cached[1]
+
+        # Floats are derived from cached Decimal rates instead of fetching and decoding again.
+        # Not the other way round, a Decimal must keep the digits of the literal in the response
+        if not use_decimal:
+            cached = self._get_cached_rates(base_cur, date_str, True)
+            if cached is not None:
+                stored_at, decimal_rates = cached
+                rates = dict((cur, float(rate)) for cur, rate in decimal_rates.items())
+                validators = _RATES_VALIDATORS.get((base_cur, date_str, True), {})
+                # Not marked dirty, it is derived again from the persisted entry after a restart
+                _set_rates((base_cur, date_str, False), rates, validators, stored_at=stored_at, dirty=False)
+                return rates
+        return None
+
+    def _get_request_headers(self, key):
+        # A stale entry is revalidated, the server answers 304 without a body if rates haven't changed
+        if key in _RATES_CACHE:
+            return _RATES_VALIDATORS.get(key, {})
+        return {}
+
+    def _store_rates(self, key, status_code, headers, body):
+        """
+        Cache and return the rates of a rates response for key
+        """
+        stale = _RATES_CACHE.get(key)
+        if status_code == 304 and stale is not None:
+            rates = stale[1]
+            validators = _RATES_VALIDATORS.get(key, {})
+        elif status_code == 200:
+            rates = self._decode_rates(body, use_decimal=key[2], date_str=key[1])
+            validators = {}
+            if headers.get('ETag'):
+                validators['If-None-Match'] = headers['ETag']
+            if headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = headers['Last-Modified']
+        else:
+            raise RatesNotAvailableError("Currency Rates Source Not Ready")
+        if rates:
+            _set_rates(key, rates, validators)
+        return rates
+
+    def _select_rates(self, rates, base_cur, dest_currs, date_str, use_decimal=False):
+        one = Decimal(1) if (self._force_decimal or use_decimal) else 1.
+        rates_for = {}
+        for dest_cur in dest_currs:
+            rate = one if dest_cur == base_cur else rates.get(dest_cur, None)
+            if rate is None:
+                raise RatesNotAvailableError(
+                    f"Currency Rate {base_cur} => {dest_cur} not available for Date {date_str}")
+            rates_for[dest_cur] = rate
+        return rates_for
+
+    def _get_rates(self, base_cur, date_str, use_decimal=False):
+        """
+        Rates for base_cur on date_str, served from the cache while fresh
+        """
+        use_decimal = bool(self._force_decimal or use_decimal)
+        rates = self._get_fresh_rates(base_cur, date_str, use_decimal)
+        if rates is not None:
+            return rates
+
+        key = (base_cur, date_str, use_decimal)
+        payload = {'base': base_cur, 'rtype': 'fpy'}
+        source_url = f"{_SOURCE_URL}{date_str}"
+        response = self._session.get(
+            source_url, params=payload, headers=self._get_request_headers(key), timeout=60)
+        return self._store_rates(key, response.status_code, response.headers, response.content)
 
 
 class CurrencyRates(Common):
 
+    def __init__(self, force_decimal=False, cache_ttl=3600, fast_math=False):
+        super(CurrencyRates, self).__init__(force_decimal=force_decimal, cache_ttl=cache_ttl)
+        # convert() works in float only, Decimal amounts and force_decimal are ignored
+        self._fast_math = fast_math
+        # Bind convert to the variant for these options, so calls don't re-check them.
+        # A subclass that overrides convert keeps its own method
+        if type(self).convert is not CurrencyRates.convert:
+            return
+        if fast_math:
+            self.convert = self._convert_fast
+        elif force_decimal:
+            self.convert = self._convert_decimal
+        else:
+            self.convert = self._convert_float
+
     def get_rates(self, base_cur, date_obj=None):
         date_str = self._get_date_string(date_obj)
-        payload = {'base': base_cur, 'rtype': 'fpy'}
-        source_url = self._source_url() + date_str
-        response = requests.get(source_url, params=payload, timeout=60)
-        if response.status_code == 200:
-            rates = self._decode_rates(response, date_str=date_str)
-            return rates
-        raise RatesNotAvailableError("Currency Rates Source Not Ready")
+        # Hand out a copy so callers can't modify the cached rates
+        return dict(self._get_rates(base_cur, date_str))
 
     def get_rate(self, base_cur, dest_cur, date_obj=None):
         if base_cur == dest_cur:
@@ -67,45 +325,138 @@ class CurrencyRates(Common):
                 return Decimal(1)
             return 1.
         date_str = self._get_date_string(date_obj)
-        payload = {'base': base_cur, 'symbols': dest_cur, 'rtype': 'fpy'}
-        source_url = self._source_url() + date_str
-        response = requests.get(source_url, params=payload, timeout=60)
-        if response.status_code == 200:
-            rate = self._get_decoded_rate(response, dest_cur, date_str=date_str)
-            if not rate:
-                raise RatesNotAvailableError("Currency Rate {0} => {1} not available for Date {2}".format(
-                    base_cur, dest_cur, date_str))
-            return rate
-        raise RatesNotAvailableError("Currency Rates Source Not Ready")
+        rate = self._get_rates(base_cur, date_str).get(dest_cur, None)
+        if rate is None:
+            raise RatesNotAvailableError(
+                f"Currency Rate {base_cur} => {dest_cur} not available for Date {date_str}")
+        return rate
+
+    def _get_rates_for(self, base_cur, dest_currs, date_str, use_decimal=False):
+        # One request covers every destination currency
+        rates = self._get_rates(base_cur, date_str, use_decimal=use_decimal)
+        return self._select_rates(rates, base_cur, dest_currs, date_str, use_decimal=use_decimal)
+
+    def get_rates_for(self, base_cur, dest_currs, date_obj=None):
+        """
+        Get rates from base_cur to each of dest_currs with a single request
+        """
+        date_str = self._get_date_string(date_obj)
+        return self._get_rates_for(base_cur, dest_currs, date_str)
+
+    def get_rates_series(self, base_cur, date_objs, max_workers=8):
+        """
+        Get rates for base_cur on each of date_objs, fetched concurrently
+        Returns dict of {date_obj: rates}
+        """
+        date_objs = list(date_objs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_rates = executor.map(
+                lambda date_obj: self._get_rates(base_cur, self._get_date_string(date_obj)), date_objs)
+            series = dict((date_obj, dict(rates)) for date_obj, rates in zip(date_objs, all_rates))
+        # One write for the whole batch
+        _flush_rates_cache()
+        return series
+
+    def convert_portfolio(self, base_cur, amounts, dest_codes, date_obj=None):
+        """
+        Convert each of amounts from base_cur to the matching currency in dest_codes
+        Requires numpy, the conversion is compiled with numba when it is installed
+        """
+        np = _import_numpy('convert_portfolio')
+        from ._kernels import apply_rates
+        amounts = np.asarray(amounts, dtype=np.float64)
+        dest_codes = np.asarray(dest_codes)
+        if amounts.shape != dest_codes.shape:
+            raise ValueError("convert_portfolio requires amounts and dest_codes of the same shape, "
+                             f"got {amounts.shape} and {dest_codes.shape}")
+        date_str = self._get_date_string(date_obj)
+        unique_codes, idx = np.unique(dest_codes, return_inverse=True)
+        rates = self._get_rates_for(base_cur, unique_codes.tolist(), date_str)
+        rates_vec = np.array([rates[code] for code in unique_codes.tolist()], dtype=np.float64)
+        # The kernel works on flat arrays, the result keeps the shape of amounts
+        converted = apply_rates(np.ascontiguousarray(amounts).ravel(), rates_vec, idx.ravel().astype(np.intp))
+        return converted.reshape(amounts.shape)
+
+    def convert_vectorized(self, base_cur, dest_cur, amounts, date_obj=None):
+        """
+        Convert an array of amounts from base_cur to dest_cur, requires numpy
+        """
+        np = _import_numpy('convert_vectorized')
+        date_str = self._get_date_string(date_obj)
+        rate = float(self._get_rates_for(base_cur, [dest_cur], date_str)[dest_cur])
+        return np.multiply(amounts, rate, dtype=np.float64)
+
+    def convert_matrix(self, base_cur, dest_currs, amounts_per_cur, date_obj=None):
+        """
+        Convert amounts_per_cur, whose last axis follows dest_currs, from base_cur
+        to the matching currency, requires numpy
+        """
+        np = _import_numpy('convert_matrix')
+        date_str = self._get_date_string(date_obj)
+        rates = self._get_rates_for(base_cur, dest_currs, date_str)
+        rates_arr = np.fromiter((rates[dest_cur] for dest_cur in dest_currs), dtype=np.float64,
+                                count=len(dest_currs))
+        return np.multiply(amounts_per_cur, rates_arr, dtype=np.float64)
 
     def convert(self, base_cur, dest_cur, amount, date_obj=None):
-        if isinstance(amount, Decimal):
-            use_decimal = True
-        else:
-            use_decimal = self._force_decimal
+        if self._fast_math:
+            return self._convert_fast(base_cur, dest_cur, amount, date_obj)
+        if self._force_decimal:
+            return self._convert_decimal(base_cur, dest_cur, amount, date_obj)
+        return self._convert_float(base_cur, dest_cur, amount, date_obj)
+
+    def _get_convert_rate(self, base_cur, dest_cur, date_obj, use_decimal):
+        date_str = self._get_date_string(date_obj)
+        rate = self._get_rates(base_cur, date_str, use_decimal=use_decimal).get(dest_cur, None)
+        if rate is None:
+            raise RatesNotAvailableError(
+                f"Currency {base_cur} => {dest_cur} rate not available for Date {date_str}.")
+        return rate
 
+    def _convert_fast(self, base_cur, dest_cur, amount, date_obj=None):
+        if base_cur == dest_cur:
+            return float(amount)
+        return float(self._get_convert_rate(base_cur, dest_cur, date_obj, False)) * float(amount)
+
+    def _convert_float(self, base_cur, dest_cur, amount, date_obj=None):
+        if isinstance(amount, Decimal):  # Decimal amounts are converted with Decimal rates
+            return self._convert_decimal(base_cur, dest_cur, amount, date_obj)
         if base_cur == dest_cur:  # Return same amount if both base_cur, dest_cur are same
-            if use_decimal:
-                return Decimal(amount)
             return float(amount)
+        return self._get_convert_rate(base_cur, dest_cur, date_obj, False) * amount
 
+    def _convert_decimal(self, base_cur, dest_cur, amount, date_obj=None):
+        if base_cur == dest_cur:  # Return same amount if both base_cur, dest_cur are same
+            return Decimal(amount)
+        rate = self._get_convert_rate(base_cur, dest_cur, date_obj, True)
+        try:
+            return rate * amount
+        except TypeError:
+            raise DecimalFloatMismatchError(
+                "convert requires amount parameter is of type Decimal when force_decimal=True")
+
+    def convert_many(self, base_cur, dest_to_amount, date_obj=None):
+        """
+        Convert amounts given as {dest_cur: amount} from base_cur with a single request
+        As in convert, Decimal amounts are converted with Decimal rates and other amounts with float rates
+        """
+        if self._force_decimal:
+            decimal_currs, float_currs = list(dest_to_amount), []
+        else:
+            decimal_currs = [cur for cur, amount in dest_to_amount.items() if isinstance(amount, Decimal)]
+            float_currs = [cur for cur, amount in dest_to_amount.items() if not isinstance(amount, Decimal)]
         date_str = self._get_date_string(date_obj)
-        payload = {'base': base_cur, 'symbols': dest_cur, 'rtype': 'fpy'}
-        source_url = self._source_url() + date_str
-        response = requests.get(source_url, params=payload, timeout=60)
-        if response.status_code == 200:
-            rate = self._get_decoded_rate(
-                response, dest_cur, use_decimal=use_decimal, date_str=date_str)
-            if not rate:
-                raise RatesNotAvailableError("Currency {0} => {1} rate not available for Date {2}.".format(
-                    source_url, dest_cur, date_str))
-            try:
-                converted_amount = rate * amount
-                return converted_amount
-            except TypeError:
-                raise DecimalFloatMismatchError(
-                    "convert requires amount parameter is of type Decimal when force_decimal=True")
-        raise RatesNotAvailableError("Currency Rates Source Not Ready")
+        rates = {}
+        # Decimal rates first, float rates are then derived from them without another request
+        if decimal_currs:
+            rates.update(self._get_rates_for(base_cur, decimal_currs, date_str, use_decimal=True))
+        if float_currs:
+            rates.update(self._get_rates_for(base_cur, float_currs, date_str))
+        try:
+            return dict((dest_cur, rates[dest_cur] * amount) for dest_cur, amount in dest_to_amount.items())
+        except TypeError:
+            raise DecimalFloatMismatchError(
+                "convert_many requires amounts of type Decimal when force_decimal=True")
 
 
 _CURRENCY_FORMATTER = CurrencyRates()
@@ -113,28 +464,37 @@ _CURRENCY_FORMATTER = CurrencyRates()
 get_rates = _CURRENCY_FORMATTER.get_rates
 get_rate = _CURRENCY_FORMATTER.get_rate
 convert = _CURRENCY_FORMATTER.convert
+get_rates_for = _CURRENCY_FORMATTER.get_rates_for
+get_rates_series = _CURRENCY_FORMATTER.get_rates_series
+convert_portfolio = _CURRENCY_FORMATTER.convert_portfolio
+convert_vectorized = _CURRENCY_FORMATTER.convert_vectorized
+convert_matrix = _CURRENCY_FORMATTER.convert_matrix
+convert_many = _CURRENCY_FORMATTER.convert_many
 
 
-class CurrencyCodes:
+def _index_currency_data():
+    with open(_CURRENCY_FILE, 'rb') as f:
+        currency_data = _loads(f.read())
+    by_cc = {}
+    by_symbol = {}
+    # setdefault keeps the first currency listed for a shared code or symbol
+    for item in currency_data:
+        by_cc.setdefault(item['cc'], item)
+        by_symbol.setdefault(item['symbol'], item)
+    return by_cc, by_symbol
 
-    def __init__(self):
-        self.__currency_data = None
 
-    @property
-    def _currency_data(self):
-        if self.__currency_data is None:
-            file_path = os.path.dirname(os.path.abspath(__file__))
-            with open(file_path + '/raw_data/currencies.json') as f:
-                self.__currency_data = json.loads(f.read())
-        return self.__currency_data
+_CURRENCY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'raw_data', 'currencies.json')
+_BY_CC, _BY_SYMBOL = _index_currency_data()
+
+
+class CurrencyCodes:
 
     def _get_data(self, currency_code):
-        currency_dict = next((item for item in self._currency_data if item["cc"] == currency_code), None)
-        return currency_dict
+        return _BY_CC.get(currency_code)
 
     def _get_data_from_symbol(self, symbol):
-        currency_dict = next((item for item in self._currency_data if item["symbol"] == symbol), None)
-        return currency_dict
+        return _BY_SYMBOL.get(symbol)
 
     def get_symbol(self, currency_code):
         currency_dict = self._get_data(currency_code)
@@ -29,20 +29,23 @@ setup(
     long_description=long_description_text,
     packages=find_packages(exclude=['tests', 'tests.*']),
     include_package_data=True,
+    python_requires='>=3.6',
     install_requires=[
         'requests',
         'simplejson',
     ],
+    extras_require={
+        'fast': ['orjson'],
+        'numba': ['numpy', 'numba'],
+        'async': ['aiohttp'],
+    },
     classifiers=[
         'Intended Audience :: Developers',
         'Operating System :: OS Independent',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.6',
         'Topic :: Software Development :: Internationalization',
     ],
 )
@@ -1,9 +1,58 @@
 import datetime
+import json
+import os
+import tempfile
 from decimal import Decimal
-from unittest import TestCase
+from unittest import TestCase, mock, skipIf
+
+import requests
+
+from forex_python import converter
 from forex_python.converter import (get_rates, get_rate, convert, get_symbol,
                                     get_currency_name, RatesNotAvailableError,
-                                    CurrencyRates, DecimalFloatMismatchError)
+                                    CurrencyRates, DecimalFloatMismatchError,
+                                    get_rates_for, convert_many, get_rates_series,
+                                    get_currency_code_from_symbol, convert_portfolio,
+                                    convert_vectorized, convert_matrix)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class StubResponse(object):
+    """
+    Stands in for a requests response from theforexapi.com
+    """
+
+    def __init__(self, status_code=200, rates=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps({'base': 'TST', 'rates': rates or {}}).encode() if rates else b''
+
+
+class StubbedRatesTestCase(TestCase):
+    """
+    Base for tests with a stubbed session, using the made up base currency TST
+    """
+
+    def setUp(self):
+        self.clear_stub_rates()
+
+    def tearDown(self):
+        self.clear_stub_rates()
+
+    def clear_stub_rates(self):
+        for key in list(converter._RATES_CACHE):
+            if key[0] == 'TST':
+                del converter._RATES_CACHE[key]
+                converter._RATES_VALIDATORS.pop(key, None)
+        # Keep stub rates out of the on-disk cache
+        converter._rates_cache_dirty = False
+
+    def stub_session(self, *responses):
+        return mock.patch.object(requests.Session, 'get', side_effect=list(responses))
 
 
 class TestGetRates(TestCase):
@@ -43,6 +92,14 @@ class TestGetRates(TestCase):
         future = datetime.date.today() + datetime.timedelta(days=1)
         self.assertRaises(RatesNotAvailableError, get_rates, 'USD', future)
 
+    def test_get_rates_series(self):
+        dates = [datetime.date(2010, 5, 10), datetime.date(2010, 5, 11)]
+        series = get_rates_series('USD', dates)
+
+        # Check one rates dict returned per date
+        self.assertEqual(set(series.keys()), set(dates))
+        self.assertTrue(isinstance(series[dates[0]].get('INR'), float))
+
 
 class TestGetRate(TestCase):
     """
@@ -105,6 +162,109 @@ class TestAmountConvert(TestCase):
         self.assertRaises(RatesNotAvailableError, convert, 'ABC', 'XYZ', 10)
 
 
+class TestManyCurrencies(TestCase):
+    """
+    test rates and conversion for several destination currencies at once
+    """
+
+    def test_get_rates_for_valid_codes(self):
+        rates = get_rates_for('USD', ['INR', 'EUR', 'USD'])
+        self.assertEqual(set(rates.keys()), set(['INR', 'EUR', 'USD']))
+        self.assertTrue(isinstance(rates['INR'], float))
+        self.assertEqual(rates['USD'], 1.)
+
+    def test_get_rates_for_invalid_code(self):
+        self.assertRaises(RatesNotAvailableError, get_rates_for, 'USD', ['INR', 'XYZ'])
+
+    def test_convert_many(self):
+        amounts = convert_many('USD', {'INR': 10, 'EUR': 20})
+        self.assertTrue(isinstance(amounts['INR'], float))
+        self.assertTrue(isinstance(amounts['EUR'], float))
+
+
+class TestConvertManyAmountTypes(StubbedRatesTestCase):
+    """
+    test convert_many picks Decimal or float rates per amount
+    """
+
+    def test_mixed_amounts(self):
+        with self.stub_session(StubResponse(200, {'INR': 45.12, 'EUR': 0.85})) as get:
+            amounts = CurrencyRates().convert_many('TST', {'INR': Decimal('1'), 'EUR': 2.0})
+            self.assertEqual(get.call_count, 1)
+        self.assertEqual(amounts['INR'], Decimal('45.12'))
+        self.assertTrue(isinstance(amounts['EUR'], float))
+
+    def test_force_decimal_float_amount(self):
+        with self.stub_session(StubResponse(200, {'INR': 45.12, 'EUR': 0.85})):
+            self.assertRaises(DecimalFloatMismatchError, CurrencyRates(force_decimal=True).convert_many,
+                              'TST', {'INR': Decimal('1'), 'EUR': 2.0})
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestPortfolioConvert(StubbedRatesTestCase):
+    """
+    test conversion of many amounts with numpy arrays
+    """
+
+    def test_convert_portfolio(self):
+        amounts = convert_portfolio('USD', [10, 20, 30], ['INR', 'EUR', 'INR'])
+        self.assertEqual(amounts.shape, (3,))
+        self.assertAlmostEqual(amounts[2], 3 * amounts[0])
+
+    def test_convert_portfolio_keeps_shape(self):
+        with self.stub_session(StubResponse(200, {'INR': 2.})):
+            amounts = convert_portfolio('TST', [[10, 20], [30, 40]], [['INR', 'TST'], ['TST', 'INR']])
+        self.assertEqual(amounts.tolist(), [[20., 20.], [30., 80.]])
+
+    def test_convert_portfolio_shape_mismatch(self):
+        self.assertRaises(ValueError, convert_portfolio, 'USD', [10, 20, 30], ['INR'])
+
+    def test_convert_portfolio_invalid_code(self):
+        self.assertRaises(RatesNotAvailableError, convert_portfolio, 'USD', [10], ['XYZ'])
+
+    def test_convert_vectorized(self):
+        amounts = convert_vectorized('USD', 'INR', np.array([10, 20]))
+        self.assertEqual(amounts.dtype, np.float64)
+        self.assertAlmostEqual(amounts[1], 2 * amounts[0])
+
+    def test_convert_matrix(self):
+        amounts = convert_matrix('USD', ['INR', 'USD'], np.array([[10, 20], [1, 2]]))
+        self.assertEqual(amounts.shape, (2, 2))
+        self.assertEqual(amounts[1, 1], 2.)
+
+
+class TestFastMathAmountConvert(TestCase):
+    """
+    Test the fast_math=True float only conversion
+    """
+
+    def setUp(self):
+        self.c = CurrencyRates(fast_math=True)
+
+    def test_amount_decimal_convert(self):
+        amount = self.c.convert('USD', 'INR', Decimal('10.45'))
+        self.assertTrue(isinstance(amount, float))
+
+    def test_amount_convert_same_currency(self):
+        amount = self.c.convert('USD', 'USD', Decimal('10.45'))
+        self.assertEqual(amount, 10.45)
+
+
+class TestConvertOverride(TestCase):
+    """
+    Test that a subclass override of convert isn't replaced by the bound variant
+    """
+
+    def test_subclass_convert(self):
+        class RoundedRates(CurrencyRates):
+            def convert(self, base_cur, dest_cur, amount, date_obj=None):
+                return round(super(RoundedRates, self).convert(base_cur, dest_cur, amount, date_obj), 2)
+
+        for options in ({}, {'force_decimal': True}, {'fast_math': True}):
+            c = RoundedRates(**options)
+            self.assertEqual(float(c.convert('USD', 'USD', Decimal('10.456'))), 10.46)
+
+
 class TestForceDecimalAmountConvert(TestCase):
     """
     Test the force_decimal=True type enforcing
@@ -174,6 +334,135 @@ class TestForceDecimalAmountConvert(TestCase):
         self.assertRaises(RatesNotAvailableError, self.c.get_rate, 'ABCD', 'XYZ')
 
 
+class TestRatesCache(TestCase):
+    """
+    Test repeated lookups are served from the rates cache
+    """
+
+    def test_get_rates_cached_copy(self):
+        c = CurrencyRates()
+        all_rates = c.get_rates('USD')
+        all_rates['INR'] = None
+
+        # cached rates must not be changed by the caller
+        self.assertTrue(isinstance(c.get_rates('USD').get('INR'), float))
+
+    def test_cache_ttl(self):
+        c = CurrencyRates(cache_ttl=60)
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+
+        # only dates at least two days back in UTC are cached forever
+        self.assertEqual(c._get_cache_ttl('2010-05-10'), float('inf'))
+        self.assertEqual(c._get_cache_ttl((today - datetime.timedelta(days=2)).isoformat()), float('inf'))
+        self.assertEqual(c._get_cache_ttl((today - datetime.timedelta(days=1)).isoformat()), 60)
+        self.assertEqual(c._get_cache_ttl(today.isoformat()), 60)
+        self.assertEqual(c._get_cache_ttl('latest'), 60)
+
+    def test_cache_ttl_day_rollover(self):
+        c = CurrencyRates(cache_ttl=60)
+        midnight = datetime.datetime(2026, 10, 15, tzinfo=datetime.timezone.utc).timestamp()
+        with mock.patch.object(converter, '_settled_date', (0., '')):
+            with mock.patch('time.time', return_value=midnight - 1):
+                self.assertEqual(c._get_cache_ttl('2026-10-13'), 60)
+            # the cutoff moves on once the UTC day changes
+            with mock.patch('time.time', return_value=midnight):
+                self.assertEqual(c._get_cache_ttl('2026-10-13'), float('inf'))
+                self.assertEqual(c._get_cache_ttl('2026-10-14'), 60)
+
+    def test_failed_cache_write_cleaned_up(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.object(converter, '_RATES_CACHE_FILE', os.path.join(cache_dir, 'rates.json')), \
+                    mock.patch.object(converter, '_rates_cache_dirty', True), \
+                    mock.patch('os.replace', side_effect=OSError):
+                converter._flush_rates_cache()
+            # the temp file is removed when it can't be moved into place
+            self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_get_rate_matches_get_rates(self):
+        date_obj = datetime.datetime.strptime('2010-05-10', "%Y-%m-%d").date()
+        all_rates = get_rates('USD', date_obj)
+        self.assertEqual(get_rate('USD', 'INR', date_obj), all_rates['INR'])
+
+
+class TestRatesRevalidation(StubbedRatesTestCase):
+    """
+    Test expired rates are revalidated with conditional requests
+    """
+
+    def test_stale_rates_revalidated(self):
+        c = CurrencyRates(cache_ttl=0)
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Tue, 13 Oct 2026 14:00:00 GMT'}
+        with self.stub_session(StubResponse(200, {'INR': 45.12}, headers), StubResponse(304)) as get:
+            self.assertEqual(c.get_rate('TST', 'INR'), 45.12)
+            key = ('TST', 'latest', False)
+            converter._RATES_CACHE[key] = (0, converter._RATES_CACHE[key][1])
+
+            # the stale entry is sent with its validators, and a 304 serves the cached rates
+            self.assertEqual(c.get_rate('TST', 'INR'), 45.12)
+            self.assertEqual(get.call_count, 2)
+            self.assertEqual(get.call_args_list[0][1]['headers'], {})
+            self.assertEqual(get.call_args_list[1][1]['headers'], {
+                'If-None-Match': '"v1"', 'If-Modified-Since': 'Tue, 13 Oct 2026 14:00:00 GMT'})
+            # the 304 refreshes the entry's timestamp
+            self.assertTrue(converter._RATES_CACHE[key][0] > 0)
+
+    def test_fresh_rates_not_refetched(self):
+        c = CurrencyRates(cache_ttl=3600)
+        with self.stub_session(StubResponse(200, {'INR': 45.12})) as get:
+            c.get_rate('TST', 'INR')
+            c.convert('TST', 'INR', 10)
+            self.assertEqual(get.call_count, 1)
+
+
+class TestRatesNumericTypes(StubbedRatesTestCase):
+    """
+    Test float and Decimal lookups share cached rates without changing results
+    """
+
+    def stub_body(self, body):
+        response = StubResponse(200)
+        response.content = body
+        return response
+
+    def test_decimal_rates_keep_literal_digits(self):
+        body = b'{"base": "TST", "rates": {"EUR": 1.10}}'
+        for float_first in (False, True):
+            self.clear_stub_rates()
+            with self.stub_session(self.stub_body(body), self.stub_body(body)):
+                if float_first:
+                    CurrencyRates().get_rate('TST', 'EUR')
+                amount = CurrencyRates().convert('TST', 'EUR', Decimal('10'))
+            self.assertEqual(str(amount), '11.00')
+
+    def test_float_rates_derived_from_decimal(self):
+        with self.stub_session(StubResponse(200, {'INR': 45.12})) as get:
+            self.assertEqual(CurrencyRates(force_decimal=True).get_rate('TST', 'INR'), Decimal('45.12'))
+            self.assertEqual(CurrencyRates().get_rate('TST', 'INR'), 45.12)
+            self.assertEqual(get.call_count, 1)
+
+
+class TestZeroRate(StubbedRatesTestCase):
+    """
+    Test a rate of 0 is returned, not treated as missing
+    """
+
+    def test_get_rate_zero(self):
+        with self.stub_session(StubResponse(200, {'ZWD': 0, 'INR': 45.12})):
+            self.assertEqual(CurrencyRates().get_rate('TST', 'ZWD'), 0)
+            self.assertEqual(CurrencyRates().convert('TST', 'ZWD', 10), 0)
+            self.assertEqual(CurrencyRates().get_rates_for('TST', ['ZWD']), {'ZWD': 0})
+
+    def test_decimal_get_rate_zero(self):
+        with self.stub_session(StubResponse(200, {'ZWD': 0.0, 'INR': 45.12})):
+            rate = CurrencyRates(force_decimal=True).get_rate('TST', 'ZWD')
+        self.assertEqual(rate, Decimal('0'))
+        self.assertTrue(isinstance(rate, Decimal))
+
+    def test_missing_rate_still_raises(self):
+        with self.stub_session(StubResponse(200, {'INR': 45.12})):
+            self.assertRaises(RatesNotAvailableError, CurrencyRates().get_rate, 'TST', 'ZWD')
+
+
 class TestCurrencySymbol(TestCase):
     """
     test currency symbols from currency codes
@@ -196,3 +485,36 @@ class TestCurrencyName(TestCase):
 
     def test_with_invalid_currency_code(self):
         self.assertFalse(get_currency_name('XYZ'))
+
+
+class TestCurrencyCodeFromSymbol(TestCase):
+    """
+    test currency code from currency symbols
+    """
+
+    def test_with_valid_currency_symbol(self):
+        self.assertEqual(str(get_currency_code_from_symbol(u'\u20b9')), 'INR')
+
+    def test_with_invalid_currency_symbol(self):
+        self.assertFalse(get_currency_code_from_symbol('XYZ'))
+
+
+class TestDecodeRates(TestCase):
+    """
+    Test decoding of rates responses
+    """
+
+    def decode(self, body, force_decimal=False):
+        return CurrencyRates(force_decimal=force_decimal)._decode_rates(body)
+
+    def test_decimal_rates_keep_literals(self):
+        rates = self.decode(
+            b'{"base": "USD", "date": "2010-05-10", "rates": {"EUR": 1.10, "INR": 45.1234, "JPY": 150}}',
+            force_decimal=True)
+        self.assertEqual(rates, {'EUR': Decimal('1.10'), 'INR': Decimal('45.1234'), 'JPY': 150})
+        self.assertEqual(str(rates['EUR']), '1.10')
+
+    def test_float_rates(self):
+        rates = self.decode(b'{"base": "USD", "rates": {"EUR": 1.10}}')
+        self.assertEqual(rates, {'EUR': 1.1})
+        self.assertTrue(isinstance(rates['EUR'], float))
@@ -0,0 +1,183 @@
+import asyncio
+import datetime
+import json
+import threading
+from decimal import Decimal
+from unittest import TestCase, mock, skipIf
+
+try:
+    import aiohttp
+    from forex_python import aio_converter
+    from forex_python.aio_converter import AsyncCurrencyRates
+except ImportError:
+    AsyncCurrencyRates = None
+from forex_python import converter
+from forex_python.converter import RatesNotAvailableError, DecimalFloatMismatchError
+
+
+class StubResponse(object):
+    """
+    Stands in for an aiohttp response from theforexapi.com
+    """
+
+    def __init__(self, status=200, rates=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.body = json.dumps({'base': 'TST', 'rates': rates}).encode() if rates else b''
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def read(self):
+        return self.body
+
+
+@skipIf(AsyncCurrencyRates is None, "aiohttp is not installed")
+class TestAsyncCurrencyRates(TestCase):
+    """
+    Test async rates and conversion
+    """
+
+    def run_with_rates(self, check, force_decimal=False):
+        # A fresh event loop per test, the aiohttp session belongs to the loop it was made in
+        async def run():
+            async with AsyncCurrencyRates(force_decimal=force_decimal) as c:
+                await check(c)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_get_rates_valid_code(self):
+        async def check(c):
+            all_rates = await c.get_rates('USD')
+            self.assertTrue(isinstance(all_rates.get('INR'), float))
+        self.run_with_rates(check)
+
+    def test_get_rates_invalid_code(self):
+        async def check(c):
+            with self.assertRaises(RatesNotAvailableError):
+                await c.get_rates('XYZ')
+        self.run_with_rates(check)
+
+    def test_get_rate_with_date(self):
+        async def check(c):
+            date_obj = datetime.datetime.strptime('2010-05-10', "%Y-%m-%d").date()
+            rate = await c.get_rate('USD', 'INR', date_obj)
+            self.assertTrue(isinstance(rate, float))
+        self.run_with_rates(check)
+
+    def test_get_rates_for_gather(self):
+        async def check(c):
+            usd_rates, eur_rates = await asyncio.gather(
+                c.get_rates_for('USD', ['INR', 'EUR']), c.get_rates_for('EUR', ['INR', 'USD']))
+            self.assertEqual(set(usd_rates.keys()), set(['INR', 'EUR']))
+            self.assertEqual(set(eur_rates.keys()), set(['INR', 'USD']))
+        self.run_with_rates(check)
+
+    def test_amount_convert_valid_currency(self):
+        async def check(c):
+            amount = await c.convert('USD', 'INR', 10)
+            self.assertTrue(isinstance(amount, float))
+        self.run_with_rates(check)
+
+    def test_amount_decimal_convert(self):
+        async def check(c):
+            amount = await c.convert('USD', 'INR', Decimal('10.45'))
+            self.assertTrue(isinstance(amount, Decimal))
+        self.run_with_rates(check)
+
+    def test_amount_decimal_invalid_type(self):
+        async def check(c):
+            with self.assertRaises(DecimalFloatMismatchError):
+                await c.convert('USD', 'INR', 10.45)
+        self.run_with_rates(check, force_decimal=True)
+
+    def test_cache_file_loaded_off_event_loop(self):
+        threads = []
+
+        def load():
+            threads.append(threading.current_thread())
+
+        async def check(c):
+            await c._load_cache()
+        with mock.patch.object(aio_converter, '_load_rates_cache', side_effect=load):
+            self.run_with_rates(check)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+
+@skipIf(AsyncCurrencyRates is None, "aiohttp is not installed")
+class TestAsyncCurrencyRatesStubbed(TestCase):
+    """
+    Test async rates with a stubbed aiohttp session, using the made up base currency TST
+    """
+
+    def setUp(self):
+        self.clear_stub_rates()
+
+    def tearDown(self):
+        self.clear_stub_rates()
+
+    def clear_stub_rates(self):
+        for key in list(converter._RATES_CACHE):
+            if key[0] == 'TST':
+                del converter._RATES_CACHE[key]
+                converter._RATES_VALIDATORS.pop(key, None)
+        # Keep stub rates out of the on-disk cache
+        converter._rates_cache_dirty = False
+
+    def run_with_responses(self, check, *responses, **options):
+        async def run():
+            async with AsyncCurrencyRates(**options) as c:
+                await check(c)
+        loop = asyncio.new_event_loop()
+        try:
+            with mock.patch.object(aiohttp.ClientSession, 'get', side_effect=list(responses)) as get:
+                with mock.patch.object(aio_converter, '_flush_rates_cache'):
+                    loop.run_until_complete(run())
+        finally:
+            loop.close()
+        return get
+
+    def test_get_rate(self):
+        async def check(c):
+            self.assertEqual(await c.get_rate('TST', 'INR'), 45.12)
+            self.assertEqual(await c.convert('TST', 'INR', Decimal('10')), Decimal('451.20'))
+            self.assertEqual(await c.get_rates_for('TST', ['INR', 'TST']), {'INR': 45.12, 'TST': 1.})
+        get = self.run_with_responses(check, StubResponse(200, {'INR': 45.12}), StubResponse(200, {'INR': 45.12}))
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(get.call_args[1]['params'], {'base': 'TST', 'rtype': 'fpy'})
+
+    def test_missing_rate(self):
+        async def check(c):
+            with self.assertRaises(RatesNotAvailableError):
+                await c.get_rate('TST', 'ZWD')
+        self.run_with_responses(check, StubResponse(200, {'INR': 45.12}))
+
+    def test_error_status(self):
+        async def check(c):
+            with self.assertRaises(RatesNotAvailableError):
+                await c.get_rates('TST')
+        self.run_with_responses(check, StubResponse(503))
+
+    def test_stale_rates_revalidated(self):
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Tue, 13 Oct 2026 14:00:00 GMT'}
+        key = ('TST', 'latest', False)
+
+        async def check(c):
+            self.assertEqual(await c.get_rate('TST', 'INR'), 45.12)
+            converter._RATES_CACHE[key] = (0, converter._RATES_CACHE[key][1])
+            # the stale entry is sent with its validators, and a 304 serves the cached rates
+            self.assertEqual(await c.get_rate('TST', 'INR'), 45.12)
+        get = self.run_with_responses(
+            check, StubResponse(200, {'INR': 45.12}, headers), StubResponse(304), cache_ttl=0)
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(get.call_args_list[0][1]['headers'], {})
+        self.assertEqual(get.call_args_list[1][1]['headers'], {
+            'If-None-Match': '"v1"', 'If-Modified-Since': 'Tue, 13 Oct 2026 14:00:00 GMT'})
+        self.assertTrue(converter._RATES_CACHE[key][0] > 0)